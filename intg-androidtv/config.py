@@ -37,6 +37,11 @@ class AtvDevice:
     auth_error: bool = False
     """Authentication error, device requires pairing."""
 
+    @property
+    def display_model(self) -> str:
+        """Return the manufacturer and model name, limited to 30 characters."""
+        return f"{self.manufacturer} {self.model}"[:30]
+
 
 class _EnhancedJSONEncoder(json.JSONEncoder):
     """Python dataclass json encoder."""
@@ -58,6 +63,9 @@ class Devices:
         """
         self._data_path: str = data_path
         self._cfg_file_path: str = os.path.join(data_path, _CFG_FILENAME)
+        self._tmp_cfg_file_path: str = f"{self._cfg_file_path}.tmp"
+        self._default_certfile: str = os.path.join(data_path, "androidtv_remote_cert.pem")
+        self._default_keyfile: str = os.path.join(data_path, "androidtv_remote_key.pem")
         self._config: list[AtvDevice] = []
         self._add_handler = add_handler
         self._remove_handler = remove_handler
@@ -134,11 +142,11 @@ class Devices:
 
     def default_certfile(self) -> str:
         """Return the default certificate file for initializing a device."""
-        return os.path.join(self._data_path, "androidtv_remote_cert.pem")
+        return self._default_certfile
 
     def default_keyfile(self) -> str:
         """Return the default key file for initializing a device."""
-        return os.path.join(self._data_path, "androidtv_remote_key.pem")
+        return self._default_keyfile
 
     def certfile(self, atv_id: str) -> str:
         """Return the certificate file of the device."""
@@ -166,12 +174,11 @@ class Devices:
     def remove_certificates(self, atv_id: str) -> bool:
         """Remove the certificate and key files of a given Android TV instance."""
         try:
-            pem_file = self.certfile(atv_id)
-            if os.path.exists(pem_file):
-                os.remove(pem_file)
-            pem_file = self.keyfile(atv_id)
-            if os.path.exists(pem_file):
-                os.remove(pem_file)
+            for pem_file in (self.certfile(atv_id), self.keyfile(atv_id)):
+                try:
+                    os.remove(pem_file)
+                except FileNotFoundError:
+                    pass
             return True
         except OSError as ex:
             _LOG.error("Failed to remove certificate file of %s: %s", atv_id, ex)
@@ -187,8 +194,9 @@ class Devices:
 
         self._config = []
 
-        if os.path.exists(self._cfg_file_path):
-            os.remove(self._cfg_file_path)
+        for cfg_file in (self._cfg_file_path, self._tmp_cfg_file_path):
+            if os.path.exists(cfg_file):
+                os.remove(cfg_file)
 
         if self._remove_handler is not None:
             self._remove_handler(None)
@@ -199,12 +207,21 @@ class Devices:
 
         :return: True if the configuration could be saved.
         """
+        # Write to a temporary file first and flush it to storage before renaming: otherwise the rename might be
+        # persisted before the data on power loss, leaving an empty or partially written configuration file behind.
         try:
-            with open(self._cfg_file_path, "w+", encoding="utf-8") as f:
+            with open(self._tmp_cfg_file_path, "w", encoding="utf-8") as f:
                 json.dump(self._config, f, ensure_ascii=False, cls=_EnhancedJSONEncoder)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(self._tmp_cfg_file_path, self._cfg_file_path)
             return True
-        except OSError:
-            _LOG.error("Cannot write the config file")
+        except OSError as err:
+            _LOG.error("Cannot write the config file: %s", err)
+            try:
+                os.remove(self._tmp_cfg_file_path)
+            except OSError:
+                pass
 
         return False
 
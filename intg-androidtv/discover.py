@@ -7,12 +7,18 @@ Android TV device discovery with mDNS.
 
 import asyncio
 import logging
+import time
 
 from zeroconf import ServiceStateChange, Zeroconf
 from zeroconf.asyncio import AsyncServiceBrowser, AsyncServiceInfo, AsyncZeroconf
 
 _LOG = logging.getLogger(__name__)
 
+_last_discovery: tuple[float, list[dict[str, str]]] | None = None
+"""Monotonic time and result of the last shared discovery."""
+_discovery_task: asyncio.Future | None = None
+"""Running shared discovery."""
+
 
 async def android_tvs(timeout: int = 10) -> list[dict[str, str]]:
     """
@@ -64,3 +70,35 @@ async def android_tvs(timeout: int = 10) -> list[dict[str, str]]:
     except OSError as ex:
         _LOG.error("Failed to start discovery: %s", ex)
     return discovered_android_tvs
+
+
+async def android_tvs_cached(max_age: float = 60.0) -> list[dict[str, str]]:
+    """
+    Discover Android TV devices with mDNS and reuse recent discovery results.
+
+    Concurrent calls wait for the same discovery instead of starting their own, e.g. if multiple devices try to
+    resolve their IP address at the same time.
+
+    :param max_age: maximum age in seconds of a previous discovery result to return.
+    :return: list of dictionaries containing name, label, address. Shared between callers, don't modify!
+    """
+    global _discovery_task
+
+    if _last_discovery and time.monotonic() - _last_discovery[0] < max_age:
+        return _last_discovery[1]
+
+    if _discovery_task is None or _discovery_task.done():
+        _discovery_task = asyncio.ensure_future(_shared_discovery())
+    # a cancelled caller must not cancel the discovery of the other callers
+    return await asyncio.shield(_discovery_task)
+
+
+async def _shared_discovery() -> list[dict[str, str]]:
+    global _last_discovery
+
+    result = await android_tvs()
+    # Don't cache an empty result: discovery fails immediately if the network interface isn't ready yet, e.g. after a
+    # router restart. That must not disable IP address resolution of all devices for the cache duration.
+    if result:
+        _last_discovery = (time.monotonic(), result)
+    return result
@@ -130,13 +130,14 @@ async def media_player_cmd_handler(
             "Cannot execute command %s %s: no Android TV device found for entity %s",
             cmd_id,
             params if params else "",
-            entity.id,
+            atv_id,
         )
         return ucapi.StatusCodes.NOT_FOUND
 
     android_tv = _configured_android_tvs[atv_id]
 
-    _LOG.info("[%s] command: %s %s", android_tv.log_id, cmd_id, params if params else "")
+    if _LOG.isEnabledFor(logging.INFO):
+        _LOG.info("[%s] command: %s %s", android_tv.log_id, cmd_id, params if params else "")
 
     if cmd_id == media_player.Commands.ON:
         return await android_tv.turn_on()
@@ -6,8 +6,12 @@ Setup flow for Android TV Remote integration.
 """
 
 import asyncio
+import contextlib
 import logging
+import os
+from dataclasses import dataclass, field
 from enum import IntEnum
+from typing import Awaitable, Callable
 
 import discover
 import tv
@@ -30,6 +34,36 @@ from config import AtvDevice
 _LOG = logging.getLogger(__name__)
 
 
+def _web_configurator_delay() -> float:
+    """Return the optional setup response delay from ENV variable ``UC_WEBCFG_SLEEP``, or 0 if not set or invalid."""
+    value = os.getenv("UC_WEBCFG_SLEEP", "0")
+    try:
+        delay = float(value)
+    except ValueError:
+        delay = -1.0
+    if not 0 <= delay < float("inf"):
+        _LOG.warning("Ignoring invalid UC_WEBCFG_SLEEP value '%s', expected a delay in seconds", value)
+        return 0.0
+    return delay
+
+
+_DISCOVERY_TTL: float = 15.0
+"""Time in seconds to reuse previous discovery results, e.g. when retrying the setup."""
+_ATV_REMOTE_PORT: int = 6466
+"""Android TV Remote service port."""
+_PROBE_TIMEOUT: float = 3.0
+"""Connection timeout in seconds to check if a discovered device is reachable."""
+_PROBE_CONCURRENCY: int = 8
+"""Maximum number of concurrent reachability checks."""
+_WEB_CONFIGURATOR_DELAY: float = _web_configurator_delay()
+"""Optional response delay in seconds for web-configurator versions not picking up the first response."""
+_STATE_TO_ERROR: dict[tv.DeviceState, IntegrationSetupError] = {
+    tv.DeviceState.AUTH_ERROR: IntegrationSetupError.AUTHORIZATION_ERROR,
+    tv.DeviceState.TIMEOUT: IntegrationSetupError.TIMEOUT,
+}
+"""Setup error of a failed device state. All other states are reported as connection refused."""
+
+
 class SetupSteps(IntEnum):
     """Enumeration of setup steps to keep track of user data responses."""
 
@@ -40,10 +74,24 @@ class SetupSteps(IntEnum):
     PAIRING_PIN = 4
 
 
-_setup_step = SetupSteps.INIT
-_cfg_add_device: bool = False
-_discovered_android_tvs: list[dict[str, str]] = []
-_pairing_android_tv: tv.AndroidTv | None = None
+@dataclass(slots=True)
+class _SetupState:
+    """Setup flow state shared between the setup handlers."""
+
+    step: SetupSteps = SetupSteps.INIT
+    """Current setup step to validate user data responses."""
+    add_device: bool = False
+    """Add a new device to an existing configuration."""
+    discovered: dict[str, dict[str, str]] = field(default_factory=dict)
+    """Discovered Android TV devices indexed by IP address."""
+    discovery_task: asyncio.Task | None = None
+    """Discovery started in the background while the user is still on a previous setup screen."""
+    pairing_tv: tv.AndroidTv | None = None
+    """Android TV device instance used for pairing."""
+
+
+_state = _SetupState()
+
 # TODO #9 externalize language texts
 _user_input_discovery = RequestUserInput(
     {"en": "Setup mode", "de": "Setup Modus", "fr": "Installation"},
@@ -72,6 +120,60 @@ _user_input_discovery = RequestUserInput(
         },
     ],
 )
+_user_input_pairing_pin = RequestUserInput(
+    {
+        "en": "Please enter the PIN shown on your Android TV",
+        "de": "Bitte gib die auf deinem Android-Fernseher angezeigte PIN ein",
+        "fr": "Veuillez saisir le code PIN affiché sur votre Android TV",
+    },
+    [{"field": {"text": {"value": "000000"}}, "id": "pin", "label": {"en": "Android TV PIN"}}],
+)
+# TODO #9 externalize language texts
+# Static translations of the dynamic setup screens. Shared between requests, don't modify!
+_TITLE_CONFIGURATION_MODE = {"en": "Configuration mode", "de": "Konfigurations-Modus"}
+_LABEL_CONFIGURED_DEVICES = {
+    "en": "Configured devices",
+    "de": "Konfigurierte Geräte",
+    "fr": "Appareils configurés",
+}
+_LABEL_ACTION = {
+    "en": "Action",
+    "de": "Aktion",
+    "fr": "Action",
+}
+_ACTION_ADD = {
+    "id": "add",
+    "label": {
+        "en": "Add a new device",
+        "de": "Neues Gerät hinzufügen",
+        "fr": "Ajouter un nouvel appareil",
+    },
+}
+_ACTION_REMOVE = {
+    "id": "remove",
+    "label": {
+        "en": "Delete selected device",
+        "de": "Selektiertes Gerät löschen",
+        "fr": "Supprimer l'appareil sélectionné",
+    },
+}
+_ACTION_RESET = {
+    "id": "reset",
+    "label": {
+        "en": "Reset configuration and reconfigure",
+        "de": "Konfiguration zurücksetzen und neu konfigurieren",
+        "fr": "Réinitialiser la configuration et reconfigurer",
+    },
+}
+_ACTIONS_WITH_DEVICES = [_ACTION_ADD, _ACTION_REMOVE, _ACTION_RESET]
+_ACTIONS_EMPTY = [_ACTION_ADD]
+_DROPDOWN_EMPTY_DEVICE = [{"id": "", "label": {"en": "---"}}]
+_TITLE_DEVICE_CHOICE = {"en": "Please choose your Android TV", "de": "Bitte Android TV auswählen"}
+_LABEL_DEVICE_CHOICE = {
+    "en": "Choose your Android TV",
+    "de": "Wähle deinen Android TV",
+    "fr": "Choisir votre Android TV",
+}
 
 
 async def driver_setup_handler(msg: SetupDriver) -> SetupAction:
@@ -83,36 +185,24 @@ async def driver_setup_handler(msg: SetupDriver) -> SetupAction:
     :param msg: the setup driver request object, either DriverSetupRequest or UserDataResponse
     :return: the setup action on how to continue
     """
-    global _setup_step
-    global _cfg_add_device
-    global _pairing_android_tv
-
-    if isinstance(msg, DriverSetupRequest):
-        _setup_step = SetupSteps.INIT
-        _cfg_add_device = False
-        return await handle_driver_setup(msg)
-
-    if isinstance(msg, UserDataResponse):
-        _LOG.debug("UserDataResponse: %s %s", msg, _setup_step)
-        if _setup_step == SetupSteps.CONFIGURATION_MODE and "action" in msg.input_values:
-            return await handle_configuration_mode(msg)
-        if _setup_step == SetupSteps.DISCOVER and "address" in msg.input_values:
-            return await _handle_discovery(msg)
-        if _setup_step == SetupSteps.DEVICE_CHOICE and "choice" in msg.input_values:
-            return await handle_device_choice(msg)
-        if _setup_step == SetupSteps.PAIRING_PIN and "pin" in msg.input_values:
-            return await handle_user_data_pin(msg)
-        _LOG.error("No or invalid user response was received: %s", msg)
-    elif isinstance(msg, AbortDriverSetup):
-        _LOG.info("Setup was aborted with code: %s", msg.error)
-        if _pairing_android_tv is not None:
-            _pairing_android_tv.disconnect()
-            _pairing_android_tv = None
-        _setup_step = SetupSteps.INIT
-
-    # user confirmation not used in setup process
-    # if isinstance(msg, UserConfirmationResponse):
-    #     return handle_user_confirmation(msg)
+    match msg:
+        case DriverSetupRequest():
+            _state.step = SetupSteps.INIT
+            _state.add_device = False
+            return await handle_driver_setup(msg)
+        case UserDataResponse():
+            _LOG.debug("UserDataResponse: %s %s", msg, _state.step)
+            if step_handler := _STEP_HANDLERS.get(_state.step):
+                input_value, handler = step_handler
+                if input_value in msg.input_values:
+                    return await handler(msg)
+            _LOG.error("No or invalid user response was received: %s", msg)
+        case AbortDriverSetup():
+            _LOG.info("Setup was aborted with code: %s", msg.error)
+            if _state.pairing_tv is not None:
+                _state.pairing_tv.disconnect()
+                _state.pairing_tv = None
+            _state.step = SetupSteps.INIT
 
     return SetupError()
 
@@ -130,98 +220,51 @@ async def handle_driver_setup(msg: DriverSetupRequest) -> RequestUserInput | Set
     :param msg: driver setup request data, only `reconfigure` flag is of interest.
     :return: the setup action on how to continue
     """
-    global _setup_step
-
     reconfigure = msg.reconfigure
     _LOG.debug("Starting driver setup, reconfigure=%s", reconfigure)
+    # discovery takes several seconds: already start it while the user is looking at the first setup screen
+    _state.discovery_task = asyncio.create_task(discover.android_tvs_cached(max_age=_DISCOVERY_TTL))
 
     # workaround for web-configurator not picking up first response
-    await asyncio.sleep(1)
+    if _WEB_CONFIGURATOR_DELAY:
+        await asyncio.sleep(_WEB_CONFIGURATOR_DELAY)
 
     if reconfigure:
         # make sure configuration is up-to-date
         if config.devices.migration_required():
             await config.devices.migrate()
-        _setup_step = SetupSteps.CONFIGURATION_MODE
+        _state.step = SetupSteps.CONFIGURATION_MODE
 
         # get all configured devices for the user to choose from
-        dropdown_devices = []
-        for device in config.devices.all():
-            prefix = "! " if device.auth_error else ""
-            model = f"{device.manufacturer} {device.model}"[:30]
-            dropdown_devices.append(
-                {
-                    "id": device.id,
-                    "label": {"en": f"{prefix}{device.name} ({device.id}) {model}"},
-                }
-            )
-
-        # TODO #9 externalize language texts
-        # build user actions, based on available devices
-        dropdown_actions = [
-            {
-                "id": "add",
-                "label": {
-                    "en": "Add a new device",
-                    "de": "Neues Gerät hinzufügen",
-                    "fr": "Ajouter un nouvel appareil",
-                },
-            },
+        dropdown_devices = [
+            {"id": device.id, "label": {"en": _device_label(device)}} for device in config.devices.all()
         ]
 
-        # add remove & reset actions if there's at least one configured device
-        if dropdown_devices:
-            dropdown_actions.append(
-                {
-                    "id": "remove",
-                    "label": {
-                        "en": "Delete selected device",
-                        "de": "Selektiertes Gerät löschen",
-                        "fr": "Supprimer l'appareil sélectionné",
-                    },
-                },
-            )
-            dropdown_actions.append(
-                {
-                    "id": "reset",
-                    "label": {
-                        "en": "Reset configuration and reconfigure",
-                        "de": "Konfiguration zurücksetzen und neu konfigurieren",
-                        "fr": "Réinitialiser la configuration et reconfigurer",
-                    },
-                },
-            )
-        else:
+        # remove & reset actions are only available if there's at least one configured device
+        dropdown_actions = _ACTIONS_WITH_DEVICES if dropdown_devices else _ACTIONS_EMPTY
+        if not dropdown_devices:
             # dummy entry if no devices are available
-            dropdown_devices.append({"id": "", "label": {"en": "---"}})
+            dropdown_devices = _DROPDOWN_EMPTY_DEVICE
 
         return RequestUserInput(
-            {"en": "Configuration mode", "de": "Konfigurations-Modus"},
+            _TITLE_CONFIGURATION_MODE,
             [
                 {
                     "field": {"dropdown": {"value": dropdown_devices[0]["id"], "items": dropdown_devices}},
                     "id": "choice",
-                    "label": {
-                        "en": "Configured devices",
-                        "de": "Konfigurierte Geräte",
-                        "fr": "Appareils configurés",
-                    },
+                    "label": _LABEL_CONFIGURED_DEVICES,
                 },
                 {
                     "field": {"dropdown": {"value": dropdown_actions[0]["id"], "items": dropdown_actions}},
                     "id": "action",
-                    "label": {
-                        "en": "Action",
-                        "de": "Aktion",
-                        "fr": "Appareils configurés",
-                    },
+                    "label": _LABEL_ACTION,
                 },
             ],
         )
 
     # Initial setup, make sure we have a clean configuration
     config.devices.clear()  # triggers device instance removal
-    _setup_step = SetupSteps.DISCOVER
+    _state.step = SetupSteps.DISCOVER
     return _user_input_discovery
 
 
@@ -235,17 +278,15 @@ async def handle_configuration_mode(msg: UserDataResponse) -> RequestUserInput |
     :param msg: response data from the requested user data
     :return: the setup action on how to continue
     """
-    global _setup_step
-    global _cfg_add_device
-
     action = msg.input_values["action"]
 
     # workaround for web-configurator not picking up first response
-    await asyncio.sleep(1)
+    if _WEB_CONFIGURATOR_DELAY:
+        await asyncio.sleep(_WEB_CONFIGURATOR_DELAY)
 
     match action:
         case "add":
-            _cfg_add_device = True
+            _state.add_device = True
         case "remove":
             choice = msg.input_values["choice"]
             if not config.devices.remove(choice):
@@ -259,7 +300,7 @@ async def handle_configuration_mode(msg: UserDataResponse) -> RequestUserInput |
             _LOG.error("Invalid configuration action: %s", action)
             return SetupError(error_type=IntegrationSetupError.OTHER)
 
-    _setup_step = SetupSteps.DISCOVER
+    _state.step = SetupSteps.DISCOVER
     return _user_input_discovery
 
 
@@ -273,20 +314,21 @@ async def _handle_discovery(msg: UserDataResponse) -> RequestUserInput | SetupEr
     :param msg: response data from the requested user data
     :return: the setup action on how to continue
     """
-    global _discovered_android_tvs
-    global _pairing_android_tv
-    global _setup_step
-
     # clear all configured devices and any previous pairing attempt
-    if _pairing_android_tv:
-        _pairing_android_tv.disconnect()
-        _pairing_android_tv = None
+    if _state.pairing_tv:
+        _state.pairing_tv.disconnect()
+        _state.pairing_tv = None
 
     dropdown_items = []
     address = msg.input_values["address"]
 
     if address:
         _LOG.debug("Starting manual driver setup for %s", address)
+        # fail fast if nothing is listening on the given address instead of retrying the full connection for 20s
+        if (error_type := await _check_reachable(address)) is not None:
+            _LOG.warning("Manually specified device %s is not reachable: %s", address, error_type)
+            return SetupError(error_type=error_type)
+
         # Connect to device and retrieve name
         certfile = config.devices.default_certfile()
         keyfile = config.devices.default_keyfile()
@@ -297,44 +339,42 @@ async def _handle_discovery(msg: UserDataResponse) -> RequestUserInput | SetupEr
             return _setup_error_from_device_state(android_tv.state)
 
         existing = config.devices.get(android_tv.identifier)
-        if _cfg_add_device and existing and not existing.auth_error:
+        if _state.add_device and existing and not existing.auth_error:
             _LOG.info("Manually specified device '%s' %s: already configured", existing.name, android_tv.identifier)
             # no better error code at the moment
             return SetupError(error_type=IntegrationSetupError.OTHER)
         dropdown_items.append({"id": address, "label": {"en": f"{android_tv.name} [{address}]"}})
     else:
         _LOG.debug("Starting driver setup with Android TV discovery")
-        # start discovery
-        _discovered_android_tvs = await discover.android_tvs()
+        # waits for an already running discovery or returns recent discovery results
+        discovered = await discover.android_tvs_cached(max_age=_DISCOVERY_TTL)
+        _state.discovered = {item["address"]: item for item in discovered}
 
         # only add new devices or configured devices requiring new pairing
-        for discovered_tv in _discovered_android_tvs:
-            tv_data = {"id": discovered_tv["address"], "label": {"en": discovered_tv["label"]}}
+        candidates = []
+        for discovered_tv in _state.discovered.values():
             existing = config.devices.get_by_name_or_address(discovered_tv["name"], discovered_tv["address"])
-            if _cfg_add_device and existing and not existing.auth_error:
+            if _state.add_device and existing and not existing.auth_error:
                 _LOG.info(
                     "Skipping found device '%s' %s: already configured", discovered_tv["name"], discovered_tv["address"]
                 )
                 continue
-            dropdown_items.append(tv_data)
+            candidates.append(discovered_tv)
+
+        dropdown_items = await _reachable_dropdown_items(candidates)
 
     if not dropdown_items:
         _LOG.warning("No Android TVs found")
         return SetupError(error_type=IntegrationSetupError.NOT_FOUND)
 
-    _setup_step = SetupSteps.DEVICE_CHOICE
-    # TODO #9 externalize language texts
+    _state.step = SetupSteps.DEVICE_CHOICE
     return RequestUserInput(
-        {"en": "Please choose your Android TV", "de": "Bitte Android TV auswählen"},
+        _TITLE_DEVICE_CHOICE,
         [
             {
                 "field": {"dropdown": {"value": dropdown_items[0]["id"], "items": dropdown_items}},
                 "id": "choice",
-                "label": {
-                    "en": "Choose your Android TV",
-                    "de": "Wähle deinen Android TV",
-                    "fr": "Choisir votre Android TV",
-                },
+                "label": _LABEL_DEVICE_CHOICE,
             }
         ],
     )
@@ -349,41 +389,28 @@ async def handle_device_choice(msg: UserDataResponse) -> RequestUserInput | Setu
     :param msg: response data from the requested user data
     :return: the setup action on how to continue.
     """
-    global _pairing_android_tv
-    global _setup_step
-
     choice = msg.input_values["choice"]
-    name = ""
-
-    for discovered_tv in _discovered_android_tvs:
-        if discovered_tv["address"] == choice:
-            name = discovered_tv["name"]
+    discovered_tv = _state.discovered.get(choice)
+    name = discovered_tv["name"] if discovered_tv else ""
 
     certfile = config.devices.default_certfile()
     keyfile = config.devices.default_keyfile()
-    _pairing_android_tv = tv.AndroidTv(certfile, keyfile, choice, name)
+    android_tv = tv.AndroidTv(certfile, keyfile, choice, name)
+    _state.pairing_tv = android_tv
     _LOG.info("Chosen Android TV: %s. Start pairing process...", choice)
 
-    res = await _pairing_android_tv.init(20)
+    res = await android_tv.init(20)
     if res is False:
-        return _setup_error_from_device_state(_pairing_android_tv.state)
+        return _setup_error_from_device_state(android_tv.state)
 
     _LOG.info("[%s] Pairing process begin", name)
 
-    res = await _pairing_android_tv.start_pairing()
+    res = await android_tv.start_pairing()
     if res == ucapi.StatusCodes.OK:
-        _setup_step = SetupSteps.PAIRING_PIN
-        # TODO #9 externalize language texts
-        return RequestUserInput(
-            {
-                "en": "Please enter the PIN shown on your Android TV",
-                "de": "Bitte gib die auf deinem Android-Fernseher angezeigte PIN ein",
-                "fr": "Veuillez saisir le code PIN affiché sur votre Android TV",
-            },
-            [{"field": {"text": {"value": "000000"}}, "id": "pin", "label": {"en": "Android TV PIN"}}],
-        )
+        _state.step = SetupSteps.PAIRING_PIN
+        return _user_input_pairing_pin
 
-    return _setup_error_from_device_state(_pairing_android_tv.state)
+    return _setup_error_from_device_state(android_tv.state)
 
 
 async def handle_user_data_pin(msg: UserDataResponse) -> SetupComplete | SetupError:
@@ -395,66 +422,113 @@ async def handle_user_data_pin(msg: UserDataResponse) -> SetupComplete | SetupEr
     :param msg: response data from the requested user data
     :return: the setup action on how to continue: SetupComplete if a valid Android TV device was chosen.
     """
-    global _pairing_android_tv
-
-    if _pairing_android_tv is None:
+    android_tv = _state.pairing_tv
+    if android_tv is None:
         _LOG.error("Can't handle pairing pin: no device instance! Aborting setup")
         return SetupError()
 
-    _LOG.info("[%s] User has entered the PIN", _pairing_android_tv.log_id)
+    _LOG.info("[%s] User has entered the PIN", android_tv.log_id)
 
-    res = await _pairing_android_tv.finish_pairing(msg.input_values["pin"])
-    _pairing_android_tv.disconnect()
+    res = await android_tv.finish_pairing(msg.input_values["pin"])
 
     device_info = None
 
-    # Connect again to retrieve device identifier (with init()) and additional device information (with connect())
+    # The device identifier is already known from init() in the device choice step.
+    # Connect again to retrieve additional device information: connect() closes the pairing connection first.
     if res == ucapi.StatusCodes.OK:
-        _LOG.info("[%s] Pairing done, retrieving device information", _pairing_android_tv.log_id)
+        _LOG.info("[%s] Pairing done, retrieving device information", android_tv.log_id)
         res = ucapi.StatusCodes.SERVER_ERROR
-        timeout = tv.CONNECTION_TIMEOUT
-        if await _pairing_android_tv.init(timeout) and await _pairing_android_tv.connect(timeout):
-            device_info = _pairing_android_tv.device_info
+        if await android_tv.connect(tv.CONNECTION_TIMEOUT):
+            device_info = android_tv.device_info
             # Now rename the certificate files so that they are unique per device (with the identifier = mac address)
-            if config.devices.assign_default_certs_to_device(_pairing_android_tv.identifier, True):
+            if config.devices.assign_default_certs_to_device(android_tv.identifier, True):
                 res = ucapi.StatusCodes.OK
-        _pairing_android_tv.disconnect()
+    android_tv.disconnect()
 
     if res != ucapi.StatusCodes.OK:
-        state = _pairing_android_tv.state
-        _LOG.info("[%s] Setup failed: %s (state=%s)", _pairing_android_tv.log_id, res, state)
-        _pairing_android_tv = None
+        state = android_tv.state
+        _LOG.info("[%s] Setup failed: %s (state=%s)", android_tv.log_id, res, state)
+        _state.pairing_tv = None
         return _setup_error_from_device_state(state)
 
     if not device_info:
         device_info = {}
 
     device = AtvDevice(
-        _pairing_android_tv.identifier,
-        _pairing_android_tv.name,
-        _pairing_android_tv.address,
+        android_tv.identifier,
+        android_tv.name,
+        android_tv.address,
         device_info.get("manufacturer", ""),
         device_info.get("model", ""),
     )
-    config.devices.add_or_update(device)  # triggers AndroidTv instance creation
-    config.devices.store()
+    # persists the configuration and synchronously triggers AndroidTv instance creation
+    config.devices.add_or_update(device)
 
     # ATV device connection will be triggered with subscribe_entities request
 
-    _pairing_android_tv = None
-    await asyncio.sleep(1)
+    _state.pairing_tv = None
 
     _LOG.info("[%s] Setup successfully completed for %s", device.name, device.id)
     return SetupComplete()
 
 
+async def _check_reachable(address: str, timeout: float = _PROBE_TIMEOUT) -> IntegrationSetupError | None:
+    """
+    Check if the Android TV Remote service of the given address accepts connections.
+
+    :return: None if reachable, CONNECTION_REFUSED if the connection was refused, otherwise TIMEOUT.
+    """
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(address, _ATV_REMOTE_PORT), timeout)
+    except ConnectionRefusedError as ex:
+        _LOG.debug("Android TV %s refused the connection: %s", address, ex)
+        return IntegrationSetupError.CONNECTION_REFUSED
+    except (OSError, asyncio.TimeoutError) as ex:
+        _LOG.debug("Android TV %s is not reachable: %s", address, ex)
+        return IntegrationSetupError.TIMEOUT
+    writer.close()
+    with contextlib.suppress(OSError):
+        await writer.wait_closed()
+    return None
+
+
+async def _probe_addresses(addresses: list[str]) -> list[bool]:
+    """Check concurrently which of the given addresses are reachable."""
+    semaphore = asyncio.Semaphore(_PROBE_CONCURRENCY)
+
+    async def probe(address: str) -> bool:
+        async with semaphore:
+            return await _check_reachable(address) is None
+
+    return await asyncio.gather(*(probe(address) for address in addresses))
+
+
+async def _reachable_dropdown_items(discovered_tvs: list[dict[str, str]]) -> list[dict]:
+    """Return the dropdown items of the reachable discovered devices, skipping stale mDNS entries."""
+    dropdown_items = []
+    reachable = await _probe_addresses([discovered_tv["address"] for discovered_tv in discovered_tvs])
+    for discovered_tv, is_reachable in zip(discovered_tvs, reachable):
+        if not is_reachable:
+            _LOG.info("Skipping found device '%s' %s: not reachable", discovered_tv["name"], discovered_tv["address"])
+            continue
+        dropdown_items.append({"id": discovered_tv["address"], "label": {"en": discovered_tv["label"]}})
+    return dropdown_items
+
+
+def _device_label(device: AtvDevice) -> str:
+    """Return the dropdown label of a configured device, prefixed with `!` if pairing is required."""
+    prefix = "! " if device.auth_error else ""
+    return f"{prefix}{device.name} ({device.id}) {device.display_model}"
+
+
 def _setup_error_from_device_state(state: tv.DeviceState) -> SetupError:
-    match state:
-        case tv.DeviceState.AUTH_ERROR:
-            error_type = IntegrationSetupError.AUTHORIZATION_ERROR
-        case tv.DeviceState.TIMEOUT:
-            error_type = IntegrationSetupError.TIMEOUT
-        case _:
-            error_type = IntegrationSetupError.CONNECTION_REFUSED
+    return SetupError(error_type=_STATE_TO_ERROR.get(state, IntegrationSetupError.CONNECTION_REFUSED))
+
 
-    return SetupError(error_type=error_type)
+_STEP_HANDLERS: dict[SetupSteps, tuple[str, Callable[[UserDataResponse], Awaitable[SetupAction]]]] = {
+    SetupSteps.CONFIGURATION_MODE: ("action", handle_configuration_mode),
+    SetupSteps.DISCOVER: ("address", _handle_discovery),
+    SetupSteps.DEVICE_CHOICE: ("choice", handle_device_choice),
+    SetupSteps.PAIRING_PIN: ("pin", handle_user_data_pin),
+}
+"""User data response handlers of the setup steps with their required input value."""
@@ -8,9 +8,9 @@ This module implements the Android TV communication of the Remote Two integratio
 import asyncio
 import logging
 import os
+import random
 import socket
-import time
-from asyncio import AbstractEventLoop, timeout
+from asyncio import AbstractEventLoop, timeout_at
 from enum import IntEnum
 from functools import wraps
 from typing import Any, Awaitable, Callable, Concatenate, Coroutine, ParamSpec, TypeVar
@@ -39,6 +39,16 @@ MIN_RECONNECT_DELAY: float = 0.5
 BACKOFF_FACTOR: float = 1.5
 
 LONG_PRESS_DELAY: float = 0.8
+UPDATE_DELAY: float = 0.05
+"""Delay in seconds to combine device property changes into a single update event."""
+
+_NAME_MATCHING: tuple[tuple[str, str], ...] = tuple(apps.NameMatching.items())
+"""Partial app identifiers with their friendly app name, used if there's no exact app identifier mapping."""
+_STATE_ON: str = media_player.States.ON.value
+_STATE_OFF: str = media_player.States.OFF.value
+_STATE_PLAYING: str = media_player.States.PLAYING.value
+_SOURCE_LIST: list[str] = list(apps.Apps)
+"""Friendly names of the pre-defined apps. Shared between update events, don't modify!"""
 
 
 class Events(IntEnum):
@@ -72,6 +82,11 @@ class DeviceState(IntEnum):
     PAIRING_ERROR = 32
 
 
+_DISCONNECTED_STATES = frozenset((DeviceState.DISCONNECTED, DeviceState.CONNECTING))
+"""Device states without an active connection."""
+_AUTH_ERROR_STATES = frozenset((DeviceState.AUTH_ERROR, DeviceState.PAIRING_ERROR))
+"""Device states requiring a new pairing."""
+
 _AndroidTvT = TypeVar("_AndroidTvT", bound="AndroidTv")
 _P = ParamSpec("_P")
 
@@ -94,18 +109,16 @@ def async_handle_atvlib_errors(
             # use the same exceptions as the func is throwing (e.g. AndroidTVRemote.send_key_command)
             state = self.state
             if state != DeviceState.CONNECTED:
-                if state in (DeviceState.DISCONNECTED, DeviceState.CONNECTING) or self.is_on is None:
+                if state in _DISCONNECTED_STATES or self.is_on is None:
                     raise ConnectionClosed("Disconnected from device")
-                if state in (DeviceState.AUTH_ERROR, DeviceState.PAIRING_ERROR):
+                if state in _AUTH_ERROR_STATES:
                     raise InvalidAuth("Invalid authentication, device requires to be paired again")
                 raise CannotConnect(f"Device connection not active (state={state})")
 
             # workaround for "swallowed commands" since _atv.send_key_command doesn't provide a result
             # pylint: disable=W0212
-            if (
-                not (self._atv and self._atv._remote_message_protocol and self._atv._remote_message_protocol.transport)
-                or self._atv._remote_message_protocol.transport.is_closing()
-            ):
+            protocol = self._atv._remote_message_protocol if self._atv else None
+            if not (protocol and protocol.transport) or protocol.transport.is_closing():
                 _LOG.warning(
                     "[%s] Cannot send command, remote protocol is no longer active. Resetting connection.",
                     self.log_id,
@@ -167,9 +180,12 @@ class AndroidTv:
             loop=self._loop,
         )
         self._identifier: str | None = identifier
+        self._log_id: str | None = self._name if self._name else self._identifier
         self._profile: Profile | None = profile
         self._connection_attempts: int = 0
         self._reconnect_delay: float = MIN_RECONNECT_DELAY
+        self._pending_update: dict[str, Any] = {}
+        self._update_handle: asyncio.TimerHandle | None = None
 
         # Hook up callbacks
         self._atv.add_is_on_updated_callback(self._is_on_updated)
@@ -200,7 +216,7 @@ class AndroidTv:
 
         request_start = None
         success = False
-        start = time.time()
+        deadline = self._loop.time() + max_timeout if max_timeout else None
 
         while not success:
             try:
@@ -212,14 +228,14 @@ class AndroidTv:
                 )
                 # Limit connection time for async_get_name_and_mac: if a previous pairing screen is still shown,
                 # this would hang for a long time (often minutes)!
-                request_start = time.time()
-                async with timeout(CONNECTION_TIMEOUT):
+                request_start = self._loop.time()
+                async with timeout_at(self._request_deadline(request_start, deadline)):
                     name, mac = await self._atv.async_get_name_and_mac()
                 success = True
                 self._connection_attempts = 0
                 self._reconnect_delay = MIN_RECONNECT_DELAY
             except (CannotConnect, ConnectionClosed, asyncio.TimeoutError) as ex:
-                if max_timeout and time.time() - start > max_timeout:
+                if deadline is not None and self._loop.time() >= deadline:
                     self._state = DeviceState.TIMEOUT
                     _LOG.error(
                         "[%s] Abort connecting after %ds: device %s not reachable on %s. %s",
@@ -230,7 +246,7 @@ class AndroidTv:
                         ex,
                     )
                     return False
-                await self._handle_connection_failure(time.time() - request_start, ex)
+                await self._handle_connection_failure(self._loop.time() - request_start, ex)
             except InvalidAuth as ex:
                 self._state = DeviceState.AUTH_ERROR
                 _LOG.error(
@@ -244,11 +260,18 @@ class AndroidTv:
         if not self._name:
             self._name = name
         self._identifier = mac.replace(":", "")
+        self._log_id = self._name if self._name else self._identifier
 
         self._state = DeviceState.INITIALIZED
         _LOG.debug("[%s] Android TV initialized", self.log_id)
         return True
 
+    @staticmethod
+    def _request_deadline(request_start: float, deadline: float | None) -> float:
+        """Return the deadline of a single connection request, limited by the overall deadline if set."""
+        request_deadline = request_start + CONNECTION_TIMEOUT
+        return request_deadline if deadline is None else min(request_deadline, deadline)
+
     @property
     def state(self) -> DeviceState:
         """Return the device state."""
@@ -268,7 +291,7 @@ class AndroidTv:
     @property
     def log_id(self) -> str:
         """Return a log identifier."""
-        return self._name if self._name else self._identifier
+        return self._log_id
 
     @property
     def name(self) -> str:
@@ -291,12 +314,9 @@ class AndroidTv:
         return self._atv.is_on
 
     def _backoff(self) -> float:
-        delay = self._reconnect_delay * BACKOFF_FACTOR
-        if delay >= BACKOFF_MAX:
-            self._reconnect_delay = BACKOFF_MAX
-        else:
-            self._reconnect_delay = delay
-        return self._reconnect_delay
+        self._reconnect_delay = min(self._reconnect_delay * BACKOFF_FACTOR, BACKOFF_MAX)
+        # random jitter to spread the reconnection attempts of multiple devices, e.g. after a router restart
+        return random.uniform(MIN_RECONNECT_DELAY, self._reconnect_delay)
 
     async def start_pairing(self) -> ucapi.StatusCodes:
         """
@@ -358,7 +378,7 @@ class AndroidTv:
         if isinstance(self._atv.is_on, bool) and self._atv.is_on:
             _LOG.debug("[%s] Android TV is already connected", self.log_id)
             # just to make sure the state is up-to-date
-            self.events.emit(Events.CONNECTED, self._identifier)
+            self._emit_connected()
             return True
 
         self._state = DeviceState.CONNECTING
@@ -367,7 +387,7 @@ class AndroidTv:
 
         request_start = None
         success = False
-        start = time.time()
+        deadline = self._loop.time() + max_timeout if max_timeout else None
 
         while not success:
             try:
@@ -379,8 +399,8 @@ class AndroidTv:
                     CONNECTION_TIMEOUT,
                 )
                 self.events.emit(Events.CONNECTING, self._identifier)
-                request_start = time.time()
-                async with timeout(CONNECTION_TIMEOUT):
+                request_start = self._loop.time()
+                async with timeout_at(self._request_deadline(request_start, deadline)):
                     await self._atv.async_connect()
                 success = True
                 self._connection_attempts = 0
@@ -388,10 +408,11 @@ class AndroidTv:
             except InvalidAuth:
                 self._state = DeviceState.AUTH_ERROR
                 _LOG.error("[%s] Invalid authentication for %s", self.log_id, self._identifier)
+                self._discard_update()
                 self.events.emit(Events.AUTH_ERROR, self._identifier)
                 break
             except (CannotConnect, ConnectionClosed, asyncio.TimeoutError) as ex:
-                if max_timeout and time.time() - start > max_timeout:
+                if deadline is not None and self._loop.time() >= deadline:
                     self._state = DeviceState.TIMEOUT
                     _LOG.error(
                         "[%s] Abort connecting after %ds: device %s not reachable on %s. %s",
@@ -402,7 +423,7 @@ class AndroidTv:
                         ex,
                     )
                     break
-                await self._handle_connection_failure(time.time() - request_start, ex)
+                await self._handle_connection_failure(self._loop.time() - request_start, ex)
             except Exception as ex:
                 self._state = DeviceState.ERROR
                 _LOG.error(
@@ -419,21 +440,28 @@ class AndroidTv:
                 self._state = DeviceState.ERROR
             return False
 
-        def _handle_invalid_auth() -> None:
-            self._state = DeviceState.AUTH_ERROR
-            _LOG.error("[%s] Invalid authentication for %s while reconnecting", self.log_id, self._identifier)
-            self.events.emit(Events.AUTH_ERROR, self._identifier)
-
-        self._atv.keep_reconnecting(_handle_invalid_auth)
+        self._atv.keep_reconnecting(self._handle_invalid_auth)
 
         device_info = self._atv.device_info
         _LOG.info("[%s] Device information: %s", self.log_id, device_info)
 
         self._update_app_list()
         self._state = DeviceState.CONNECTED
-        self.events.emit(Events.CONNECTED, self._identifier)
+        self._emit_connected()
         return True
 
+    def _emit_connected(self) -> None:
+        """Emit pending property changes followed by the connected event."""
+        self._flush_update()
+        self.events.emit(Events.CONNECTED, self._identifier)
+
+    def _handle_invalid_auth(self) -> None:
+        """Handle an authentication error while reconnecting."""
+        self._state = DeviceState.AUTH_ERROR
+        _LOG.error("[%s] Invalid authentication for %s while reconnecting", self.log_id, self._identifier)
+        self._discard_update()
+        self.events.emit(Events.AUTH_ERROR, self._identifier)
+
     async def _handle_connection_failure(self, connect_duration: float, ex):
         self._connection_attempts += 1
         # backoff delay must deduct time spent in the connection attempt
@@ -452,8 +480,9 @@ class AndroidTv:
         # try resolving IP address from device name if we keep failing to connect, maybe the IP address changed
         if self._connection_attempts % 10 == 0:
             _LOG.debug("[%s] Start resolving IP address for %s...", self.log_id, self._identifier)
+            discovery_start = self._loop.time()
             try:
-                discovered = await discover.android_tvs()
+                discovered = await discover.android_tvs_cached()
                 for item in discovered:
                     if item["name"] == self._name:
                         if self._atv.host != item["address"]:
@@ -466,7 +495,10 @@ class AndroidTv:
             except Exception as e:
                 # extra safety, otherwise reconnection task is dead
                 _LOG.error("[%s] Discovery failed: %s", self.log_id, e)
-        else:
+            # the discovery time counts towards the backoff delay, a cached discovery result is returned immediately
+            backoff -= self._loop.time() - discovery_start
+
+        if backoff > 0:
             await asyncio.sleep(backoff)
 
     def disconnect(self) -> None:
@@ -474,62 +506,78 @@ class AndroidTv:
         self._reconnect_delay = MIN_RECONNECT_DELAY
         self._atv.disconnect()
         self._state = DeviceState.DISCONNECTED
+        self._discard_update()
         self.events.emit(Events.DISCONNECTED, self._identifier)
 
+    def _schedule_update(self, update: dict[str, Any]) -> None:
+        """
+        Emit an update event with the changed device properties after a short delay.
+
+        The device callbacks often fire in quick succession, e.g. power state, current app and volume. Changes within
+        the ``UPDATE_DELAY`` are combined into a single update event, later changes of a property win.
+        """
+        self._pending_update.update(update)
+        if self._update_handle is None:
+            self._update_handle = self._loop.call_later(UPDATE_DELAY, self._flush_update)
+
+    def _flush_update(self) -> None:
+        """Emit pending property changes now. Required before emitting a connection state event to keep the order."""
+        if self._update_handle is not None:
+            self._update_handle.cancel()
+            self._update_handle = None
+        if self._pending_update:
+            update = self._pending_update
+            self._pending_update = {}
+            self.events.emit(Events.UPDATE, self._identifier, update)
+
+    def _discard_update(self) -> None:
+        """Drop pending property changes, they are no longer valid without a device connection."""
+        if self._update_handle is not None:
+            self._update_handle.cancel()
+            self._update_handle = None
+        self._pending_update = {}
+
     # Callbacks
     def _is_on_updated(self, is_on: bool) -> None:
         """Notify that the Android TV power state is updated."""
         _LOG.info("[%s] is on: %s", self.log_id, is_on)
-        update = {}
-        if is_on:
-            update["state"] = media_player.States.ON.value
-        else:
-            update["state"] = media_player.States.OFF.value
-        self.events.emit(Events.UPDATE, self._identifier, update)
+        self._schedule_update({"state": _STATE_ON if is_on else _STATE_OFF})
 
     def _current_app_updated(self, current_app: str) -> None:
         """Notify that the current app on Android TV is updated."""
-        _LOG.debug("[%s] current_app: %s", self.log_id, current_app)
-        update = {"source": current_app}
-
-        if current_app in apps.IdMappings:
-            update["source"] = apps.IdMappings[current_app]
-        else:
-            for query, app in apps.NameMatching.items():
-                if query in current_app:
-                    update["source"] = app
-                    break
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("[%s] current_app: %s", self.log_id, current_app)
+        source = apps.IdMappings.get(current_app)
+        if source is None:
+            source = next((app for query, app in _NAME_MATCHING if query in current_app), current_app)
+        update = {"source": source}
 
         # TODO verify "idle" apps, probably best to make them configurable
         if current_app in ("com.google.android.tvlauncher", "com.android.systemui"):
-            update["state"] = media_player.States.ON.value
+            update["state"] = _STATE_ON
             update["title"] = ""
         else:
-            update["state"] = media_player.States.PLAYING.value
+            update["state"] = _STATE_PLAYING
             update["title"] = update["source"]
 
-        self.events.emit(Events.UPDATE, self._identifier, update)
+        self._schedule_update(update)
 
     def _volume_info_updated(self, volume_info: dict[str, str | bool]) -> None:
         """Notify that the Android TV volume information is updated."""
-        _LOG.debug("[%s] volume_info: %s", self.log_id, volume_info)
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("[%s] volume_info: %s", self.log_id, volume_info)
         update = {"volume": volume_info["level"], "muted": volume_info["muted"]}
-        self.events.emit(Events.UPDATE, self._identifier, update)
+        self._schedule_update(update)
 
     def _is_available_updated(self, is_available: bool):
         """Notify that the Android TV is ready to receive commands or is unavailable."""
         _LOG.info("[%s] is_available: %s", self.log_id, is_available)
         self._state = DeviceState.CONNECTED if is_available else DeviceState.CONNECTING
+        self._flush_update()
         self.events.emit(Events.CONNECTED if is_available else Events.DISCONNECTED, self.identifier)
 
     def _update_app_list(self) -> None:
-        update = {}
-        source_list = []
-        for app in apps.Apps:
-            source_list.append(app)
-
-        update["source_list"] = source_list
-        self.events.emit(Events.UPDATE, self._identifier, update)
+        self._schedule_update({"source_list": _SOURCE_LIST})
 
     async def send_media_player_command(self, cmd_id: str) -> ucapi.StatusCodes:
         """
@@ -577,8 +625,8 @@ class AndroidTv:
 
         :param source: the friendly source name or an app-link / id
         """
-        if source in apps.Apps:
-            return await self._launch_app(apps.Apps[source]["url"])
+        if app := apps.Apps.get(source):
+            return await self._launch_app(app["url"])
         if source in inputs.KeyCode:
             return await self._switch_input(source)
 